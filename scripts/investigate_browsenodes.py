@@ -7,83 +7,28 @@ the category hierarchy returned by PA-API.
 """
 
 import argparse
-import datetime
-import hashlib
-import hmac
 import os
 import json
-import requests
+from paapi_sigv4 import HOST, create_session, get_signed_headers, wait_for_rate_limit
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-def sign(key, msg):
-    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+ENDPOINT = 'https://' + HOST + '/paapi5/getitems'
 
-def get_signature_key(key, date_stamp, region_name, service_name):
-    k_date = sign(('AWS4' + key).encode('utf-8'), date_stamp)
-    k_region = sign(k_date, region_name)
-    k_service = sign(k_region, service_name)
-    k_signing = sign(k_service, 'aws4_request')
-    return k_signing
-
-def get_signed_headers(access_key, secret_key, region, service, host, payload):
-    method = 'POST'
-    canonical_uri = '/paapi5/getitems'
-    
-    t = datetime.datetime.utcnow()
-    amz_date = t.strftime('%Y%m%dT%H%M%SZ')
-    date_stamp = t.strftime('%Y%m%d')
-
-    canonical_querystring = ''
-    canonical_headers = 'host:' + host + '\n' + 'x-amz-date:' + amz_date + '\n' + 'x-amz-target:com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems\n'
-    signed_headers = 'host;x-amz-date;x-amz-target'
-    payload_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
-
-    canonical_request = method + '\n' + canonical_uri + '\n' + canonical_querystring + '\n' + canonical_headers + '\n' + signed_headers + '\n' + payload_hash
-    
-    algorithm = 'AWS4-HMAC-SHA256'
-    credential_scope = date_stamp + '/' + region + '/' + service + '/' + 'aws4_request'
-    string_to_sign = algorithm + '\n' +  amz_date + '\n' +  credential_scope + '\n' +  hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
-
-    signing_key = get_signature_key(secret_key, date_stamp, region, service)
-    signature = hmac.new(signing_key, (string_to_sign).encode('utf-8'), hashlib.sha256).hexdigest()
-
-    authorization_header = algorithm + ' ' + 'Credential=' + access_key + '/' + credential_scope + ', ' +  'SignedHeaders=' + signed_headers + ', ' + 'Signature=' + signature
-    
-    headers = {
-        'host': host,
-        'x-amz-date': amz_date,
-        'x-amz-target': 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems',
-        'content-type': 'application/json; charset=utf-8',
-        'authorization': authorization_header,
-        'content-encoding': 'amz-1.0'
-    }
-    return headers
-
-if __name__ == '__main__':
-    parser = argparse.ArgumentParser(
-        description='Investigate BrowseNodes structure from Amazon PA-API'
-    )
-    parser.add_argument(
-        'asin',
-        type=str,
-        help='Amazon Standard Identification Number (ASIN) of the product'
-    )
-    args = parser.parse_args()
+# Reuse one keep-alive connection pool for every PA-API call in the process
+SESSION = create_session()
 
+def fetch(asin):
+    """Send a signed GetItems request including BrowseNodeInfo and return the response."""
     access_key = os.environ.get("AMAZON_ACCESS_KEY")
     secret_key = os.environ.get("AMAZON_SECRET_KEY")
     partner_tag = os.environ.get("AMAZON_PARTNER_TAG")
-    
-    host = 'webservices.amazon.co.jp'
-    region = 'us-west-2'
-    service = 'ProductAdvertisingAPI'
 
     # Include BrowseNodeInfo to investigate category hierarchy
     payload_dict = {
-        "ItemIds": [args.asin],
+        "ItemIds": [asin],
         "PartnerTag": partner_tag,
         "PartnerType": "Associates",
         "Resources": [
@@ -93,14 +38,31 @@ if __name__ == '__main__':
             "BrowseNodeInfo.BrowseNodes.SalesRank"
         ]
     }
-    payload = json.dumps(payload_dict)
+    payload = json.dumps(payload_dict, separators=(',', ':')).encode('utf-8')
+
+    wait_for_rate_limit()
+    headers = get_signed_headers(access_key, secret_key, 'GetItems', payload)
+    return SESSION.post(ENDPOINT, data=payload, headers=headers)
+
+def walk_ancestors(node):
+    """Yield a BrowseNode's Ancestor chain from the nearest parent up to the root."""
+    while node:
+        yield node
+        node = node.get('Ancestor')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Investigate BrowseNodes structure from Amazon PA-API'
+    )
+    parser.add_argument(
+        'asin',
+        type=str,
+        help='Amazon Standard Identification Number (ASIN) of the product'
+    )
+    args = parser.parse_args()
 
-    headers = get_signed_headers(access_key, secret_key, region, service, host, payload)
-    
-    endpoint = 'https://' + host + '/paapi5/getitems'
-    
     try:
-        r = requests.post(endpoint, data=payload, headers=headers)
+        r = fetch(args.asin)
         response_json = r.json()
         
         # Print the full response for investigation
@@ -129,12 +91,10 @@ if __name__ == '__main__':
                     
                     if 'Ancestor' in node:
                         print("  Ancestor Chain:")
-                        ancestor = node['Ancestor']
-                        depth = 1
-                        while ancestor:
-                            print(f"    {'  ' * depth}└─ {ancestor.get('DisplayName', 'N/A')} (Id: {ancestor.get('Id', 'N/A')})")
-                            ancestor = ancestor.get('Ancestor')
-                            depth += 1
+                        print("\n".join(
+                            f"    {'  ' * depth}└─ {ancestor.get('DisplayName', 'N/A')} (Id: {ancestor.get('Id', 'N/A')})"
+                            for depth, ancestor in enumerate(walk_ancestors(node['Ancestor']), 1)
+                        ))
                     
                     if 'SalesRank' in node:
                         print(f"  SalesRank: {node['SalesRank']}")
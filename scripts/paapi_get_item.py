@@ -6,8 +6,11 @@ This script retrieves product information from Amazon Product Advertising API (P
 and saves it to a JSON file for use by Jules or other automated processes.
 
 Usage:
-    python paapi_get_item.py <ASIN>
+    python paapi_get_item.py <ASIN> [<ASIN> ...]
     python paapi_get_item.py B06WRS9737
+    python paapi_get_item.py B06WRS9737 B09BZ59Y51 -o tmp/products.json
+
+When more than one ASIN is given, the output file contains an object keyed by ASIN.
 
 Required Environment Variables:
     - AMAZON_ACCESS_KEY: Your PA-API access key
@@ -16,85 +19,30 @@ Required Environment Variables:
 """
 
 import argparse
-import datetime
-import hashlib
-import hmac
 import os
 import json
-import requests
-
-def sign(key, msg):
-    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
-
-def get_signature_key(key, date_stamp, region_name, service_name):
-    k_date = sign(('AWS4' + key).encode('utf-8'), date_stamp)
-    k_region = sign(k_date, region_name)
-    k_service = sign(k_region, service_name)
-    k_signing = sign(k_service, 'aws4_request')
-    return k_signing
-
-def get_signed_headers(access_key, secret_key, region, service, host, payload):
-    method = 'POST'
-    canonical_uri = '/paapi5/getitems'
-    
-    t = datetime.datetime.utcnow()
-    amz_date = t.strftime('%Y%m%dT%H%M%SZ')
-    date_stamp = t.strftime('%Y%m%d')
-
-    canonical_querystring = ''
-    canonical_headers = 'host:' + host + '\n' + 'x-amz-date:' + amz_date + '\n' + 'x-amz-target:com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems\n'
-    signed_headers = 'host;x-amz-date;x-amz-target'
-    payload_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
-
-    canonical_request = method + '\n' + canonical_uri + '\n' + canonical_querystring + '\n' + canonical_headers + '\n' + signed_headers + '\n' + payload_hash
-    
-    algorithm = 'AWS4-HMAC-SHA256'
-    credential_scope = date_stamp + '/' + region + '/' + service + '/' + 'aws4_request'
-    string_to_sign = algorithm + '\n' +  amz_date + '\n' +  credential_scope + '\n' +  hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
-
-    signing_key = get_signature_key(secret_key, date_stamp, region, service)
-    signature = hmac.new(signing_key, (string_to_sign).encode('utf-8'), hashlib.sha256).hexdigest()
-
-    authorization_header = algorithm + ' ' + 'Credential=' + access_key + '/' + credential_scope + ', ' +  'SignedHeaders=' + signed_headers + ', ' + 'Signature=' + signature
-    
-    headers = {
-        'host': host,
-        'x-amz-date': amz_date,
-        'x-amz-target': 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.GetItems',
-        'content-type': 'application/json; charset=utf-8',
-        'authorization': authorization_header,
-        'content-encoding': 'amz-1.0'
-    }
-    return headers
-
-if __name__ == '__main__':
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(
-        description='Retrieve product information from Amazon PA-API'
-    )
-    parser.add_argument(
-        'asin',
-        type=str,
-        help='Amazon Standard Identification Number (ASIN) of the product'
-    )
-    parser.add_argument(
-        '--output', '-o',
-        type=str,
-        default='tmp/product_info.json',
-        help='Output file path (default: tmp/product_info.json)'
-    )
-    args = parser.parse_args()
-
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from paapi_sigv4 import HOST, create_session, get_signed_headers, wait_for_rate_limit
+
+ENDPOINT = 'https://' + HOST + '/paapi5/getitems'
+# GetItems accepts up to 10 ItemIds per request
+MAX_ITEM_IDS = 10
+# Batches are sent concurrently; wait_for_rate_limit() keeps them within the PA-API TPS quota
+MAX_WORKERS = 4
+
+# Reuse one keep-alive connection pool for every PA-API call in the process
+SESSION = create_session()
+
+def fetch(asins):
+    """Send a signed GetItems request for up to MAX_ITEM_IDS ASINs and return the response."""
     access_key = os.environ.get("AMAZON_ACCESS_KEY")
     secret_key = os.environ.get("AMAZON_SECRET_KEY")
     partner_tag = os.environ.get("AMAZON_PARTNER_TAG")
-    
-    host = 'webservices.amazon.co.jp'
-    region = 'us-west-2'
-    service = 'ProductAdvertisingAPI'
 
     payload_dict = {
-        "ItemIds": [args.asin],
+        "ItemIds": list(asins),
         "PartnerTag": partner_tag,
         "PartnerType": "Associates",
         "Resources": [
@@ -108,73 +56,147 @@ if __name__ == '__main__':
             "Offers.Listings.Price"
         ]
     }
-    payload = json.dumps(payload_dict)
-
-    headers = get_signed_headers(access_key, secret_key, region, service, host, payload)
-    
-    endpoint = 'https://' + host + '/paapi5/getitems'
-    
+    payload = json.dumps(payload_dict, separators=(',', ':')).encode('utf-8')
+
+    wait_for_rate_limit()
+    headers = get_signed_headers(access_key, secret_key, 'GetItems', payload)
+    return SESSION.post(ENDPOINT, data=payload, headers=headers)
+
+@dataclass(slots=True)
+class Product:
+    """Product information written to product_info.json."""
+    product_name: str | None = None
+    brand: str | None = None
+    manufacturer: str | None = None
+    price: float | None = None
+    image_url: str | None = None
+    features: list = field(default_factory=list)
+    specifications: dict = field(default_factory=dict)
+    dimensions: dict = field(default_factory=dict)
+    model_number: str | None = None
+
+    def to_dict(self):
+        """Return the camelCase layout used by product_info.json."""
+        data = {
+            "productName": self.product_name,
+            "brand": self.brand,
+            "manufacturer": self.manufacturer,
+            "price": self.price,
+            "imageUrl": self.image_url,
+            "features": self.features,
+            "specifications": self.specifications,
+            "dimensions": self.dimensions
+        }
+        if self.model_number is not None:
+            data["modelNumber"] = self.model_number
+        return data
+
+def dig(d, *keys, default=None):
+    """Follow nested keys/indexes through a PA-API response, returning default if any is missing."""
+    current = d
     try:
-        r = requests.post(endpoint, data=payload, headers=headers)
-        response_json = r.json()
-        
-        if 'ItemsResult' in response_json and 'Items' in response_json['ItemsResult']:
-            item = response_json['ItemsResult']['Items'][0]
-            item_info = item.get('ItemInfo', {})
-            
-            data = {
-                "productName": item_info.get('Title', {}).get('DisplayValue'),
-                "brand": item_info.get('ByLineInfo', {}).get('Brand', {}).get('DisplayValue'),
-                "manufacturer": item_info.get('ByLineInfo', {}).get('Manufacturer', {}).get('DisplayValue'),
-                "price": item['Offers']['Listings'][0]['Price']['Amount'] if 'Offers' in item else None,
-                "imageUrl": item.get('Images', {}).get('Primary', {}).get('Large', {}).get('URL'),
-                "features": item_info.get('Features', {}).get('DisplayValues', []),
-                "specifications": {},
-                "dimensions": {}
+        for key in keys:
+            current = current[key]
+    except (KeyError, IndexError, TypeError):
+        return default
+    return current
+
+def extract_product(item):
+    """Build a Product from a single GetItems item."""
+    item_info = item.get('ItemInfo', {})
+
+    product = Product(
+        product_name=dig(item_info, 'Title', 'DisplayValue'),
+        brand=dig(item_info, 'ByLineInfo', 'Brand', 'DisplayValue'),
+        manufacturer=dig(item_info, 'ByLineInfo', 'Manufacturer', 'DisplayValue'),
+        price=dig(item, 'Offers', 'Listings', 0, 'Price', 'Amount'),
+        image_url=dig(item, 'Images', 'Primary', 'Large', 'URL'),
+        features=dig(item_info, 'Features', 'DisplayValues', default=[]),
+        # ManufactureInfo (Model number etc.)
+        model_number=dig(item_info, 'ManufactureInfo', 'ItemModelNumber', 'DisplayValue')
+    )
+
+    # ProductInfo (Dimensions, Weight, Color, Size)
+    p_info = item_info.get('ProductInfo', {})
+    dims = p_info.get('ItemDimensions', {})
+    for dim_type in ['Height', 'Length', 'Width', 'Weight']:
+        if dim_type in dims:
+            product.dimensions[dim_type.lower()] = {
+                "value": dims[dim_type]['DisplayValue'],
+                "unit": dims[dim_type]['Unit']
             }
+    if 'Color' in p_info:
+        product.specifications["color"] = p_info['Color']['DisplayValue']
+    if 'Size' in p_info:
+        product.specifications["size"] = p_info['Size']['DisplayValue']
+
+    # TechnicalInfo
+    for key, value in item_info.get('TechnicalInfo', {}).items():
+        if isinstance(value, dict) and 'DisplayValue' in value:
+            product.specifications[key] = value['DisplayValue']
+
+    return product
+
+if __name__ == '__main__':
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(
+        description='Retrieve product information from Amazon PA-API'
+    )
+    parser.add_argument(
+        'asin',
+        type=str,
+        nargs='+',
+        help='Amazon Standard Identification Number (ASIN) of the product (multiple ASINs are fetched in batches of 10)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        type=str,
+        default='tmp/product_info.json',
+        help='Output file path (default: tmp/product_info.json)'
+    )
+    args = parser.parse_args()
 
-            # ManufactureInfo (Model number etc.)
-            if 'ManufactureInfo' in item_info:
-                m_info = item_info['ManufactureInfo']
-                if 'ItemModelNumber' in m_info:
-                    data["modelNumber"] = m_info['ItemModelNumber']['DisplayValue']
-
-            # ProductInfo (Dimensions, Weight, Color, Size)
-            if 'ProductInfo' in item_info:
-                p_info = item_info['ProductInfo']
-                if 'ItemDimensions' in p_info:
-                    dims = p_info['ItemDimensions']
-                    for dim_type in ['Height', 'Length', 'Width', 'Weight']:
-                        if dim_type in dims:
-                            data["dimensions"][dim_type.lower()] = {
-                                "value": dims[dim_type]['DisplayValue'],
-                                "unit": dims[dim_type]['Unit']
-                            }
-                if 'Color' in p_info:
-                    data["specifications"]["color"] = p_info['Color']['DisplayValue']
-                if 'Size' in p_info:
-                    data["specifications"]["size"] = p_info['Size']['DisplayValue']
-
-            # TechnicalInfo
-            if 'TechnicalInfo' in item_info:
-                t_info = item_info['TechnicalInfo']
-                for key, value in t_info.items():
-                    if isinstance(value, dict) and 'DisplayValue' in value:
-                        data["specifications"][key] = value['DisplayValue']
-
-            # Create output directory if needed
-            output_dir = os.path.dirname(args.output)
-            if output_dir and not os.path.exists(output_dir):
-                os.makedirs(output_dir)
-
-            with open(args.output, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            print(f"Product information for {args.asin} saved to {args.output}")
-        else:
-            print("Could not find item in response:")
-            print(json.dumps(response_json, indent=2))
-
-    except Exception as e:
-        print(f"Request failed: {e}")
-        if 'r' in locals():
-            print(r.text)
+    chunks = [args.asin[i:i + MAX_ITEM_IDS] for i in range(0, len(args.asin), MAX_ITEM_IDS)]
+    products = {}
+    failed_chunks = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(fetch, chunk) for chunk in chunks]
+        # A failed batch is reported and skipped so the other batches are still saved
+        for chunk, future in zip(chunks, futures):
+            r = None
+            try:
+                r = future.result()
+                r.raise_for_status()
+                response_json = r.json()
+
+                if 'ItemsResult' in response_json and 'Items' in response_json['ItemsResult']:
+                    for item in response_json['ItemsResult']['Items']:
+                        products[item['ASIN']] = extract_product(item).to_dict()
+                    if 'Errors' in response_json:
+                        print("Could not find some items in response:")
+                        print(json.dumps(response_json['Errors'], indent=2))
+                else:
+                    print("Could not find item in response:")
+                    print(json.dumps(response_json, indent=2))
+
+            except Exception as e:
+                failed_chunks.append(chunk)
+                print(f"Request failed for batch {' '.join(chunk)}: {e}")
+                if r is not None:
+                    print(f"HTTP {r.status_code}")
+                    print(r.text)
+
+    if products:
+        # Create output directory if needed
+        output_dir = os.path.dirname(args.output)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        # A single ASIN keeps the flat product_info.json layout
+        data = next(iter(products.values())) if len(args.asin) == 1 else products
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=2, ensure_ascii=False))
+        print(f"Product information for {', '.join(products)} saved to {args.output}")
+
+    if failed_chunks:
+        sys.exit(1)
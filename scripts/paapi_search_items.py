@@ -16,56 +16,38 @@ Required Environment Variables:
 """
 
 import argparse
-import datetime
-import hashlib
-import hmac
 import os
 import json
-import requests
+from paapi_sigv4 import HOST, create_session, get_signed_headers, wait_for_rate_limit
 
-def sign(key, msg):
-    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+ENDPOINT = 'https://' + HOST + '/paapi5/searchitems'
 
-def get_signature_key(key, date_stamp, region_name, service_name):
-    k_date = sign(('AWS4' + key).encode('utf-8'), date_stamp)
-    k_region = sign(k_date, region_name)
-    k_service = sign(k_region, service_name)
-    k_signing = sign(k_service, 'aws4_request')
-    return k_signing
+# Reuse one keep-alive connection pool for every PA-API call in the process
+SESSION = create_session()
 
-def get_signed_headers(access_key, secret_key, region, service, host, payload):
-    method = 'POST'
-    canonical_uri = '/paapi5/searchitems'
-
-    t = datetime.datetime.utcnow()
-    amz_date = t.strftime('%Y%m%dT%H%M%SZ')
-    date_stamp = t.strftime('%Y%m%d')
-
-    canonical_querystring = ''
-    canonical_headers = 'host:' + host + '\n' + 'x-amz-date:' + amz_date + '\n' + 'x-amz-target:com.amazon.paapi5.v1.ProductAdvertisingAPIv1.SearchItems\n'
-    signed_headers = 'host;x-amz-date;x-amz-target'
-    payload_hash = hashlib.sha256(payload.encode('utf-8')).hexdigest()
-
-    canonical_request = method + '\n' + canonical_uri + '\n' + canonical_querystring + '\n' + canonical_headers + '\n' + signed_headers + '\n' + payload_hash
-
-    algorithm = 'AWS4-HMAC-SHA256'
-    credential_scope = date_stamp + '/' + region + '/' + service + '/' + 'aws4_request'
-    string_to_sign = algorithm + '\n' +  amz_date + '\n' +  credential_scope + '\n' +  hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
-
-    signing_key = get_signature_key(secret_key, date_stamp, region, service)
-    signature = hmac.new(signing_key, (string_to_sign).encode('utf-8'), hashlib.sha256).hexdigest()
-
-    authorization_header = algorithm + ' ' + 'Credential=' + access_key + '/' + credential_scope + ', ' +  'SignedHeaders=' + signed_headers + ', ' + 'Signature=' + signature
+def search(keywords, search_index='All'):
+    """Send a signed SearchItems request for the given keywords and return the response."""
+    access_key = os.environ.get("AMAZON_ACCESS_KEY")
+    secret_key = os.environ.get("AMAZON_SECRET_KEY")
+    partner_tag = os.environ.get("AMAZON_PARTNER_TAG")
 
-    headers = {
-        'host': host,
-        'x-amz-date': amz_date,
-        'x-amz-target': 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.SearchItems',
-        'content-type': 'application/json; charset=utf-8',
-        'authorization': authorization_header,
-        'content-encoding': 'amz-1.0'
+    payload_dict = {
+        "Keywords": keywords,
+        "PartnerTag": partner_tag,
+        "PartnerType": "Associates",
+        "SearchIndex": search_index,
+        "Resources": [
+            "ItemInfo.Title",
+            "ItemInfo.ByLineInfo",
+            "BrowseNodeInfo.BrowseNodes",
+            "Offers.Listings.Price"
+        ]
     }
-    return headers
+    payload = json.dumps(payload_dict, separators=(',', ':')).encode('utf-8')
+
+    wait_for_rate_limit()
+    headers = get_signed_headers(access_key, secret_key, 'SearchItems', payload)
+    return SESSION.post(ENDPOINT, data=payload, headers=headers)
 
 if __name__ == '__main__':
     # Parse command line arguments
@@ -91,34 +73,8 @@ if __name__ == '__main__':
     )
     args = parser.parse_args()
 
-    access_key = os.environ.get("AMAZON_ACCESS_KEY")
-    secret_key = os.environ.get("AMAZON_SECRET_KEY")
-    partner_tag = os.environ.get("AMAZON_PARTNER_TAG")
-
-    host = 'webservices.amazon.co.jp'
-    region = 'us-west-2'
-    service = 'ProductAdvertisingAPI'
-
-    payload_dict = {
-        "Keywords": args.keywords,
-        "PartnerTag": partner_tag,
-        "PartnerType": "Associates",
-        "SearchIndex": args.search_index,
-        "Resources": [
-            "ItemInfo.Title",
-            "ItemInfo.ByLineInfo",
-            "BrowseNodeInfo.BrowseNodes",
-            "Offers.Listings.Price"
-        ]
-    }
-    payload = json.dumps(payload_dict)
-
-    headers = get_signed_headers(access_key, secret_key, region, service, host, payload)
-
-    endpoint = 'https://' + host + '/paapi5/searchitems'
-
     try:
-        r = requests.post(endpoint, data=payload, headers=headers)
+        r = search(args.keywords, args.search_index)
         response_json = r.json()
 
         # Create output directory if needed
@@ -127,7 +83,7 @@ if __name__ == '__main__':
             os.makedirs(output_dir)
 
         with open(args.output, "w", encoding="utf-8") as f:
-            json.dump(response_json, f, indent=2, ensure_ascii=False)
+            f.write(json.dumps(response_json, indent=2, ensure_ascii=False))
         print(f"Search results for '{args.keywords}' saved to {args.output}")
 
     except Exception as e:
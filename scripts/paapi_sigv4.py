@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+PA-API Request Signing Helper
+
+AWS Signature Version 4 signing and the HTTP session shared by the PA-API scripts
+in this directory.
+
+Usage:
+    from paapi_sigv4 import HOST, create_session, get_signed_headers
+
+    session = create_session()
+    headers = get_signed_headers(access_key, secret_key, 'GetItems', payload)
+"""
+
+import datetime
+import functools
+import hashlib
+import hmac
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+HOST = 'webservices.amazon.co.jp'
+REGION = 'us-west-2'
+SERVICE = 'ProductAdvertisingAPI'
+TARGET_PREFIX = 'com.amazon.paapi5.v1.ProductAdvertisingAPIv1.'
+AWS4_REQUEST = b'aws4_request'
+# PA-API allows 1 request per second by default; lower this if the account's TPS quota is higher
+MIN_REQUEST_INTERVAL = 1.0
+# Retries replay the already signed request, whose signature only stays valid for a few
+# minutes; capping Retry-After keeps all five retries inside that window
+MAX_RETRY_AFTER = 30
+
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+def sign(key, msg):
+    return hmac.digest(key, msg, 'sha256')
+
+# The derived key only changes with the date, so reuse it across requests.
+# The secret key is part of the cache key, so rotated credentials are re-derived.
+@functools.lru_cache(maxsize=8)
+def get_signature_key(key, date_stamp, region_name, service_name):
+    k_date = sign(('AWS4' + key).encode('utf-8'), date_stamp.encode('utf-8'))
+    k_region = sign(k_date, region_name.encode('utf-8'))
+    k_service = sign(k_region, service_name.encode('utf-8'))
+    k_signing = sign(k_service, AWS4_REQUEST)
+    return k_signing
+
+def wait_for_rate_limit():
+    """Block until the next request slot allowed by MIN_REQUEST_INTERVAL."""
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        delay = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + MIN_REQUEST_INTERVAL
+    if delay > 0:
+        time.sleep(delay)
+
+class PAAPIRetry(Retry):
+    """Retry that keeps replayed requests within the TPS quota and the signature's lifetime."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, MAX_RETRY_AFTER)
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        # urllib3 replays inside the adapter, so take a slot from the same limiter as fresh requests
+        wait_for_rate_limit()
+
+def create_session():
+    """Return a keep-alive session that retries throttling and transient PA-API errors."""
+    # Backoff doubles from 0.5s unless PA-API sends a (capped) Retry-After header
+    retry = PAAPIRetry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=['POST'],
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+    return session
+
+def get_signed_headers(access_key, secret_key, operation, payload, region=REGION, service=SERVICE, host=HOST):
+    """Return the signed request headers for a PA-API operation such as 'GetItems'."""
+    method = 'POST'
+    canonical_uri = '/paapi5/' + operation.lower()
+    target = TARGET_PREFIX + operation
+
+    amz_date = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    date_stamp = amz_date[:8]
+
+    canonical_querystring = ''
+    canonical_headers = f'host:{host}\nx-amz-date:{amz_date}\nx-amz-target:{target}\n'
+    signed_headers = 'host;x-amz-date;x-amz-target'
+    payload_hash = hashlib.sha256(payload).hexdigest()
+
+    canonical_request = f'{method}\n{canonical_uri}\n{canonical_querystring}\n{canonical_headers}\n{signed_headers}\n{payload_hash}'
+
+    algorithm = 'AWS4-HMAC-SHA256'
+    credential_scope = f'{date_stamp}/{region}/{service}/aws4_request'
+    canonical_request_hash = hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+    string_to_sign = f'{algorithm}\n{amz_date}\n{credential_scope}\n{canonical_request_hash}'
+
+    signing_key = get_signature_key(secret_key, date_stamp, region, service)
+    signature = sign(signing_key, string_to_sign.encode('utf-8')).hex()
+
+    authorization_header = f'{algorithm} Credential={access_key}/{credential_scope}, SignedHeaders={signed_headers}, Signature={signature}'
+
+    headers = {
+        'host': host,
+        'x-amz-date': amz_date,
+        'x-amz-target': target,
+        'content-type': 'application/json; charset=utf-8',
+        'authorization': authorization_header,
+        'content-encoding': 'amz-1.0'
+    }
+    return headers